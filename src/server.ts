@@ -100,7 +100,118 @@ app.get('/test-bfl', async (_req: Request, res: Response) => {
   }
 });
 
+// Fetch the current BFL result for a request, trying each regional endpoint
+async function fetchBflResult(requestId: string, bflApiKey: string): Promise<any> {
+  // Try different regional endpoints
+  const endpoints = [
+    `https://api.eu2.bfl.ai/v1/get_result?id=${requestId}`,
+    `https://api.eu4.bfl.ai/v1/get_result?id=${requestId}`,
+    `https://api.us1.bfl.ai/v1/get_result?id=${requestId}`
+  ];
+  
+  let response = null;
+  let lastError = null;
+  
+  for (const pollingUrl of endpoints) {
+    try {
+      console.log(`🔄 Trying polling URL: ${pollingUrl}`);
+      response = await fetch(pollingUrl, {
+        method: 'GET',
+        headers: {
+          'accept': 'application/json',
+          'x-key': bflApiKey
+        }
+      });
+      
+      if (response.ok) {
+        console.log(`✅ Success with URL: ${pollingUrl}`);
+        break;
+      } else {
+        console.log(`❌ Failed with URL: ${pollingUrl} - ${response.status}`);
+      }
+    } catch (error) {
+      const errorMessage = error instanceof Error ? error.message : 'Unknown error';
+      console.log(`❌ Error with URL: ${pollingUrl} - ${errorMessage}`);
+      lastError = error;
+    }
+  }
+  
+  if (!response || !response.ok) {
+    throw new Error(`All polling endpoints failed. Last error: ${lastError instanceof Error ? lastError.message : 'Unknown error'}`);
+  }
+  
+  return response.json();
+}
+
+const POLL_STREAM_TIMEOUT_MS = 90000; // below server.timeout and the client read timeout, so the timeout event arrives
+const POLL_STREAM_MIN_DELAY_MS = 100; // first retry, doubled on every poll
+const POLL_STREAM_MAX_DELAY_MS = 2000;
+const POLL_STREAM_JITTER_MS = 50;
+const TERMINAL_STATUSES = ['Ready', 'Error', 'Failed', 'Request Moderated', 'Content Moderated'];
+const POLL_STREAM_MAX_NOT_FOUND = 5; // `Task not found` replies before giving up on the job
+
+// Stream BFL status and progress changes as Server-Sent Events until the job settles
+async function streamBflResult(req: Request, res: Response, requestId: string, bflApiKey: string) {
+  res.writeHead(200, {
+    'Content-Type': 'text/event-stream',
+    'Cache-Control': 'no-cache',
+    'Connection': 'keep-alive'
+  });
+  
+  let closed = false;
+  req.on('close', () => { closed = true; });
+  
+  const send = (payload: Record<string, unknown>) => {
+    res.write(`data: ${JSON.stringify({ ...payload, timestamp: new Date().toISOString() })}\n\n`);
+  };
+  
+  const deadline = Date.now() + POLL_STREAM_TIMEOUT_MS;
+  let lastStatus: string | undefined;
+  let lastProgress: unknown;
+  let attempt = 0;
+  let notFoundCount = 0;
+  
+  while (!closed && Date.now() < deadline) {
+    // SSE comment as keep-alive, so neither side idles out while the status stays Pending
+    res.write(': ping\n\n');
+    try {
+      const data = await fetchBflResult(requestId, bflApiKey);
+      if (data.status === 'Task not found') {
+        // Often transient right after submission, so it is not forwarded; only giving up is
+        notFoundCount += 1;
+        if (notFoundCount >= POLL_STREAM_MAX_NOT_FOUND) {
+          send({ status: 'not_found', error: `BFL has no job with id ${requestId}` });
+          break;
+        }
+      } else {
+        if (data.status !== lastStatus || data.progress !== lastProgress || TERMINAL_STATUSES.includes(data.status)) {
+          lastStatus = data.status;
+          lastProgress = data.progress;
+          send({ status: data.status, progress: data.progress, result: data.result, error: data.error });
+        }
+        if (TERMINAL_STATUSES.includes(data.status)) {
+          break;
+        }
+      }
+    } catch (error) {
+      console.error('❌ Polling failed:', error);
+      send({ status: 'error', error: error instanceof Error ? error.message : 'Unknown error' });
+      break;
+    }
+    // Exponential backoff with jitter: fast jobs return quickly, slow ones cost fewer requests
+    const delay = Math.min(POLL_STREAM_MIN_DELAY_MS * 2 ** attempt, POLL_STREAM_MAX_DELAY_MS);
+    attempt += 1;
+    await new Promise((resolve) => setTimeout(resolve, delay + Math.random() * POLL_STREAM_JITTER_MS));
+  }
+  
+  if (!closed && Date.now() >= deadline) {
+    send({ status: 'timeout', error: 'Image generation timed out' });
+  }
+  res.end();
+}
+
 // Poll for BFL image generation result
+// Clients sending `Accept: text/event-stream` get status updates pushed over one connection
 app.get('/api/poll-image/:requestId', async (req: Request, res: Response) => {
   try {
     const { requestId } = req.params;
@@ -113,48 +224,11 @@ app.get('/api/poll-image/:requestId', async (req: Request, res: Response) => {
       });
     }
     
-    // Try different regional endpoints
-    const endpoints = [
-      `https://api.eu2.bfl.ai/v1/get_result?id=${requestId}`,
-      `https://api.eu4.bfl.ai/v1/get_result?id=${requestId}`,
-      `https://api.us1.bfl.ai/v1/get_result?id=${requestId}`
-    ];
-    
-    let response = null;
-    let lastError = null;
-    
-    for (const pollingUrl of endpoints) {
-      try {
-        console.log(`🔄 Trying polling URL: ${pollingUrl}`);
-        response = await fetch(pollingUrl, {
-          method: 'GET',
-          headers: {
-            'accept': 'application/json',
-            'x-key': bflApiKey
-          }
-        });
-        
-        if (response.ok) {
-          console.log(`✅ Success with URL: ${pollingUrl}`);
-          break;
-        } else {
-          console.log(`❌ Failed with URL: ${pollingUrl} - ${response.status}`);
-        }
-      } catch (error) {
-        const errorMessage = error instanceof Error ? error.message : 'Unknown error';
-        console.log(`❌ Error with URL: ${pollingUrl} - ${errorMessage}`);
-        lastError = error;
-      }
-    }
-    
-    if (!response || !response.ok) {
-      return res.status(500).json({
-        error: `All polling endpoints failed. Last error: ${lastError instanceof Error ? lastError.message : 'Unknown error'}`,
-        status: 'error'
-      });
+    if (req.accepts(['json', 'text/event-stream']) === 'text/event-stream') {
+      return await streamBflResult(req, res, requestId, bflApiKey);
     }
     
-    const data = await response.json();
+    const data = await fetchBflResult(requestId, bflApiKey);
     
     return res.json({
       status: data.status,
@@ -165,6 +239,9 @@ app.get('/api/poll-image/:requestId', async (req: Request, res: Response) => {
     
   } catch (error) {
     console.error('❌ Polling failed:', error);
+    if (res.headersSent) {
+      return res.end();
+    }
     return res.status(500).json({
       error: error instanceof Error ? error.message : 'Unknown error',
       status: 'error'
@@ -1,14 +1,69 @@
 #!/usr/bin/env python3
 """Fashion Creative Generator - Streamlit Frontend"""
 
+import html
+import logging
+import math
+import os
+import random
 import streamlit as st
-import requests
-import pandas as pd
+import msgspec
 import time
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 # Configuration
-LOCAL_SERVER_URL = "http://localhost:3000/api/generate-creative"
+LOCAL_SERVER_BASE = "http://localhost:3000"
+LOCAL_SERVER_URL = f"{LOCAL_SERVER_BASE}/api/generate-creative"
+POLL_IMAGE_URL = f"{LOCAL_SERVER_BASE}/api/poll-image/{{}}"
+PERSONAS_PATH = "personas.xlsx"
+# Comma-separated persona columns, split into lists once at load time
+LIST_COLUMNS = ("style_palette", "archetypes", "color_palette")
+
+# Image statuses that end the stream without a result
+IMAGE_FAILURE_STATUSES = (
+    "Error", "Failed", "error", "timeout", "not_found",
+    "Request Moderated", "Content Moderated",
+)
+
+# Form options
+AGE_RANGES = ("18-24", "25-34", "35-44", "45-54", "55-64", "65+")
+GENDERS = ("male", "female", "unisex", "non-binary")
+PRICE_TIERS = ("budget", "mid", "premium", "luxury")
+CATEGORIES = ("fashion", "lifestyle", "beauty", "travel", "food", "tech")
+COPY_TONES = ("friendly", "luxury", "minimal", "bold", "casual", "professional")
+SELECT_OPTIONS = {
+    "age_range": AGE_RANGES,
+    "gender": GENDERS,
+    "price_tier": PRICE_TIERS,
+    "preferred_category": CATEGORIES,
+    "copy_tone": COPY_TONES,
+}
+
+# Form widget keys in st.session_state and their initial values;
+# the part after "fld_" matches the persona column it is filled from
+FORM_DEFAULTS = {
+    "fld_email": "",
+    "fld_display_name": "",
+    "fld_country": "US",
+    "fld_city": "New York",
+    "fld_followers": 1000,
+    "fld_posts_count": 100,
+    "fld_is_private": False,
+    "fld_is_verified": False,
+    "fld_persona_label": "Demo",
+    "fld_persona_confidence": 0.8,
+    "fld_style_palette": "minimalist,bold",
+    "fld_archetypes": "LuxuryClassic",
+    "fld_color_palette": "#1E90FF,#8B4513,#C0C0C0",
+    "fld_age_range": "25-34",
+    "fld_gender": "unisex",
+    "fld_peak_hours": "9-17",
+    "fld_price_tier": "budget",
+    "fld_preferred_category": "fashion",
+    "fld_copy_tone": "friendly",
+}
 
 # Page config
 st.set_page_config(
@@ -19,7 +74,7 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
+_CSS = """
 <style>
     .main-header {
         text-align: center;
@@ -51,93 +106,583 @@ st.markdown("""
         margin: 1rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+st.markdown(_CSS, unsafe_allow_html=True)
 
-def load_personas_from_excel():
-    """Load personas from Excel file"""
+def _excel_engine():
+    """Prefer the calamine reader when it is installed, fall back to openpyxl"""
     try:
-        df = pd.read_excel('personas.xlsx')
-        return df
+        import python_calamine  # noqa: F401
+        return "calamine"
+    except ImportError:
+        return None
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _read_personas(path, mtime):
+    """Parse the personas workbook; `mtime` is only part of the cache key"""
+    import pandas as pd
+
+    df = pd.read_excel(path, engine=_excel_engine())
+    for col in LIST_COLUMNS:
+        if col in df.columns:
+            df[col] = (
+                df[col].fillna("").astype(str).str.split(",")
+                .map(lambda xs: [x.strip() for x in xs if x.strip()])
+            )
+    if 'persona_label' in df.columns:
+        persona_counts = df['persona_label'].value_counts()
+    else:
+        persona_counts = pd.Series(dtype="int64")
+    return df, persona_counts, df.to_dict(orient="records")
+
+
+def list_to_text(value):
+    """Render a pre-split persona list back into its comma-separated form"""
+    if isinstance(value, list):
+        return ", ".join(value)
+    return value
+
+
+def load_personas_from_excel(path=PERSONAS_PATH):
+    """Load personas from Excel file (cached until the file changes)"""
+    try:
+        return _read_personas(path, os.path.getmtime(path))
     except Exception as e:
+        import pandas as pd
+
         st.error(f"Error loading personas: {str(e)}")
-        return pd.DataFrame()
+        return pd.DataFrame(), pd.Series(dtype="int64"), []
+
+
+def apply_persona(persona):
+    """Fill the form widgets from a persona row"""
+    st.session_state.sample_data = persona
+    for key, default in FORM_DEFAULTS.items():
+        column = key[len("fld_"):]
+        value = persona.get(column)
+        # Fall back to the default so no field keeps the previous persona's value
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            value = default
+        elif column in SELECT_OPTIONS and value not in SELECT_OPTIONS[column]:
+            value = default
+        if isinstance(default, bool):
+            value = bool(value)
+        elif isinstance(default, int):
+            value = int(value)
+        elif isinstance(default, float):
+            value = float(value)
+        else:
+            value = str(list_to_text(value))
+        st.session_state[key] = value
+
+
+@st.cache_resource
+def get_http_client():
+    """Shared HTTP client so calls to the local server reuse keep-alive connections"""
+    import httpx
+
+    return httpx.Client(
+        timeout=120,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=8, max_keepalive_connections=8)
+    )
+
+
+def split_string(str_val):
+    """Split comma-separated strings into arrays"""
+    if not str_val or isinstance(str_val, (int, float)):
+        return []
+    return [s.strip() for s in str(str_val).split(',') if s.strip()]
+
+
+def field_list(text, preset):
+    """Reuse the list split at load time unless the user edited the field"""
+    if isinstance(preset, list) and text == list_to_text(preset):
+        return preset
+    return split_string(text)
+
+
+def build_request_payload(sample_data, *, email, display_name, country, city,
+                          followers, posts_count, is_private, is_verified,
+                          persona_label, persona_confidence, style_palette,
+                          archetypes, color_palette, age_range, gender,
+                          peak_hours, price_tier, preferred_category, copy_tone):
+    """Build the request body in the format expected by the local server"""
+    # Build profile object
+    profile = {
+        "contact_id": sample_data.get('id', f"FASH-{int(time.time())}"),
+        "email": email,
+        "firstname": display_name.split(' ')[0] if display_name else 'Demo',
+        "lastname": ' '.join(display_name.split(' ')[1:]) if display_name and ' ' in display_name else '',
+        "locale": sample_data.get('language', 'en-US'),
+        "country": country,
+        "city": city,
+        "tags": field_list(style_palette, sample_data.get('style_palette')),
+        "interest_keywords": field_list(archetypes, sample_data.get('archetypes')),
+        "age_range": age_range,
+        "gender": gender,
+        "budget_range": price_tier,
+        "persona_label": persona_label,
+        "persona_confidence": persona_confidence,
+        "followers": followers,
+        "following": sample_data.get('following', 0),
+        "posts_count": posts_count,
+        "is_private": is_private,
+        "is_verified": is_verified,
+        "preferred_category": preferred_category,
+        "peak_hours": peak_hours,
+        "copy_tone": copy_tone
+    }
+
+    # Build product object
+    product = {
+        "sku": f"SKU-{sample_data.get('id', 'DEMO')}",
+        "title": f"Premium Fashion Item for {persona_label}",
+        "category": "hoodies",
+        "colorways": field_list(color_palette, sample_data.get('color_palette')),
+        "price_band": price_tier,
+        "launch_type": "drop",
+        "brand_name": "Demo Brand",
+        "season": "all-season",
+        "material": "cotton"
+    }
+
+    # Build options object
+    options = {
+        "aspect": "1:1",
+        "channel": "instagram_feed",
+        "fallback_image_url": "https://dummyimage.com/1080x1080/111827/f5f5f5.png&text=Backup",
+        "ab_variant": "A",
+        "style_preference": "modern",
+        "mood": "confident",
+        "target_audience": "fashion_enthusiasts"
+    }
+
+    # Final data structure expected by the server
+    return {
+        "profile": profile,
+        "product": product,
+        "options": options,
+        "metadata": {
+            "source": "streamlit_frontend",
+            "timestamp": datetime.now().isoformat(),
+            "version": "2.0",
+            "persona_json": sample_data.get('persona_json', '{}')
+        }
+    }
 
 
 def call_local_server(data):
     """Call local server directly"""
+    import httpx
+
     try:
-        # Debug: Show what we're sending
-        st.write("🔍 **DEBUG - Sending data to server:**")
-        st.write(f"- Data keys: {list(data.keys())}")
-        st.write(f"- Profile keys: {list(data.get('profile', {}).keys())}")
-        st.write(f"- Product keys: {list(data.get('product', {}).keys())}")
-        st.write(f"- Options keys: {list(data.get('options', {}).keys())}")
+        logger.debug("Sending data to server, keys: %s", list(data.keys()))
         
-        response = requests.post(LOCAL_SERVER_URL, json=data, timeout=120)
-        st.write(f"🔍 **DEBUG - Server Response Status:** {response.status_code}")
-        st.write(f"🔍 **DEBUG - Server Response Headers:** {dict(response.headers)}")
+        response = get_http_client().post(
+            LOCAL_SERVER_URL,
+            content=msgspec.json.encode(data),
+            headers={"Content-Type": "application/json"}
+        )
+        logger.debug("Server response status: %s", response.status_code)
         
         try:
-            result = response.json()
-            st.write(f"🔍 **DEBUG - Parsed JSON Response:** {result}")
-        except Exception as e:
-            st.write(f"🔍 **DEBUG - JSON Parse Error:** {str(e)}")
-            st.write(f"🔍 **DEBUG - Raw Response Text:** {response.text}")
+            result = msgspec.json.decode(response.content)
+        except msgspec.DecodeError as e:
+            logger.debug("JSON parse error: %s, raw response: %s", e, response.text)
             result = {"error": f"JSON parse error: {str(e)}"}
         
         return result, response.status_code
-    except requests.exceptions.RequestException as e:
-        st.write(f"🔍 **DEBUG - Request error:** {str(e)}")
+    except httpx.HTTPError as e:
+        logger.debug("Request error: %s", e)
         return {"error": str(e)}, 500
 
-def poll_for_image(request_id):
-    """Poll for the final image from BFL API"""
+def fetch_image_bytes(url):
+    """Download the generated image so it ships with the page instead of a second browser fetch"""
+    import httpx
+
     try:
-        response = requests.get(
-            f"http://localhost:3000/api/poll-image/{request_id}",
-            timeout=10
+        response = get_http_client().get(url, timeout=10)
+        response.raise_for_status()
+        return response.content
+    except httpx.HTTPError as e:
+        logger.debug("Image prefetch failed, falling back to URL: %s", e)
+        return None
+
+def stream_image_status(request_id):
+    """Yield BFL image status events pushed by the local server over SSE"""
+    import httpx
+
+    try:
+        with get_http_client().stream(
+            "GET",
+            POLL_IMAGE_URL.format(request_id),
+            headers={"Accept": "text/event-stream"}
+        ) as response:
+            if response.status_code != 200:
+                yield {"status": "error", "error": f"Polling failed: {response.status_code}"}
+                return
+            for line in response.iter_lines():
+                if line.startswith("data:"):
+                    yield msgspec.json.decode(line[5:])
+    except (httpx.HTTPError, msgspec.DecodeError) as e:
+        yield {"status": "error", "error": f"Polling error: {str(e)}"}
+
+@st.fragment
+def profile_form_fragment():
+    """User profile form; widget interaction only reruns this fragment"""
+    st.header("👤 User Profile")
+
+    # Form fields
+    with st.form("user_profile_form"):
+        # Basic Info
+        st.subheader("Basic Information")
+        email = st.text_input(
+            "Email *", 
+            key="fld_email",
+            help="Required field"
+        )
+        display_name = st.text_input(
+            "Display Name *", 
+            key="fld_display_name",
+            help="Required field"
+        )
+
+        # Location
+        col_country, col_city = st.columns(2)
+        with col_country:
+            country = st.text_input(
+                "Country",
+                key="fld_country"
+            )
+        with col_city:
+            city = st.text_input(
+                "City",
+                key="fld_city"
+            )
+
+        # Social Media Info
+        st.subheader("Social Media Profile")
+        col_followers, col_posts = st.columns(2)
+        with col_followers:
+            followers = st.number_input(
+                "Followers",
+                min_value=0,
+                key="fld_followers"
+            )
+        with col_posts:
+            posts_count = st.number_input(
+                "Posts Count",
+                min_value=0,
+                key="fld_posts_count"
+            )
+
+        col_private, col_verified = st.columns(2)
+        with col_private:
+            is_private = st.checkbox(
+                "Private Account",
+                key="fld_is_private"
+            )
+        with col_verified:
+            is_verified = st.checkbox(
+                "Verified Account",
+                key="fld_is_verified"
+            )
+
+        # Persona Info
+        st.subheader("Persona Information")
+        col_persona, col_confidence = st.columns(2)
+        with col_persona:
+            persona_label = st.text_input(
+                "Persona Label",
+                key="fld_persona_label"
+            )
+        with col_confidence:
+            persona_confidence = st.slider(
+                "Persona Confidence",
+                min_value=0.0,
+                max_value=1.0,
+                key="fld_persona_confidence",
+                step=0.1,
+                help="Confidence level of persona classification"
+            )
+
+        # Style Preferences
+        st.subheader("Style Preferences")
+        style_palette = st.text_input(
+            "Style Palette",
+            key="fld_style_palette",
+            help="Comma-separated values"
+        )
+        archetypes = st.text_input(
+            "Archetypes",
+            key="fld_archetypes",
+            help="Comma-separated values"
+        )
+        color_palette = st.text_input(
+            "Color Palette",
+            key="fld_color_palette",
+            help="Comma-separated hex colors"
+        )
+
+        # Demographics
+        st.subheader("Demographics")
+        col_age, col_gender = st.columns(2)
+        with col_age:
+            age_range = st.selectbox(
+                "Age Range",
+                AGE_RANGES,
+                key="fld_age_range"
+            )
+        with col_gender:
+            gender = st.selectbox(
+                "Gender",
+                GENDERS,
+                key="fld_gender"
+            )
+
+        col_peak_hours, col_price = st.columns(2)
+        with col_peak_hours:
+            peak_hours = st.text_input(
+                "Peak Hours",
+                key="fld_peak_hours",
+                help="e.g., 9-17, 18-22"
+            )
+        with col_price:
+            price_tier = st.selectbox(
+                "Price Tier",
+                PRICE_TIERS,
+                key="fld_price_tier"
+            )
+
+        # Content Preferences
+        st.subheader("Content Preferences")
+        preferred_category = st.selectbox(
+            "Preferred Category",
+            CATEGORIES,
+            key="fld_preferred_category"
+        )
+
+        copy_tone = st.selectbox(
+            "Copy Tone",
+            COPY_TONES,
+            key="fld_copy_tone"
         )
-        if response.status_code == 200:
-            return response.json()
+
+
+        # Submit button
+        submitted = st.form_submit_button("🎨 Generate Creative", type="primary")
+
+        # Auto-generate if random creative was requested
+        if st.session_state.get('auto_generate', False):
+            submitted = True
+            st.session_state.auto_generate = False  # Reset the flag
+
+        # Handle form submission INSIDE the form context
+        if submitted:
+            # Validate required fields
+            if not email or not display_name:
+                st.error("Please fill in the required fields: Email and Display Name")
+                return
+
+            # Prepare data in the format expected by the local server
+            data = build_request_payload(
+                st.session_state.sample_data,
+                email=email,
+                display_name=display_name,
+                country=country,
+                city=city,
+                followers=followers,
+                posts_count=posts_count,
+                is_private=is_private,
+                is_verified=is_verified,
+                persona_label=persona_label,
+                persona_confidence=persona_confidence,
+                style_palette=style_palette,
+                archetypes=archetypes,
+                color_palette=color_palette,
+                age_range=age_range,
+                gender=gender,
+                peak_hours=peak_hours,
+                price_tier=price_tier,
+                preferred_category=preferred_category,
+                copy_tone=copy_tone
+            )
+
+            # Keep the request around for the debug panel
+            st.session_state.last_request = data
+            st.session_state.last_image_bytes = None
+            st.session_state.last_image_error = None
+
+            # One status container, updated in place, for the whole generation
+            with st.status("🎨 Generating your fashion creative...", expanded=False) as status:
+                # Call API
+                status.update(label="🎨 Calling the creative API...")
+                result, status_code = call_local_server(data)
+
+                # Check if we need to poll for image
+                if (status_code == 200 and result.get('success', True) and 
+                    result.get('status') == 'image_polling' and 
+                    result.get('creative', {}).get('request_id')):
+
+                    request_id = result['creative']['request_id']
+                    status.update(label=f"⏳ Waiting for image generation (Request ID: {request_id})")
+
+                    # Stream status updates for the final image
+                    event_count = 0
+                    for poll_result in stream_image_status(request_id):
+                        event_count += 1
+                        poll_status = poll_result.get('status', 'Unknown')
+
+                        logger.debug("Update %d: status=%s, error=%s", event_count, poll_status, poll_result.get('error'))
+
+                        if poll_status == 'Ready':
+                            # Update the result with the final image
+                            if poll_result.get('result', {}).get('sample'):
+                                result['creative']['image_url'] = poll_result['result']['sample']
+                                result['status'] = 'image_generated'
+                                st.session_state.last_image_bytes = fetch_image_bytes(poll_result['result']['sample'])
+                                logger.debug("Final image URL: %s", poll_result['result']['sample'])
+                            final_label, final_state = "✅ Image generation completed!", "complete"
+                            break
+                        elif poll_status in IMAGE_FAILURE_STATUSES:
+                            # Keep the outcome for the result panel, the rerun below clears this column
+                            result['status'] = 'image_failed'
+                            st.session_state.last_image_error = f"⚠️ Image generation failed: {poll_result.get('error') or poll_status}. Using fallback image."
+                            final_label, final_state = f"⚠️ Image generation failed: {poll_result.get('error') or poll_status}", "error"
+                            break
+                        else:
+                            progress = poll_result.get('progress')
+                            if isinstance(progress, (int, float)):
+                                status.update(label=f"⏳ Image generation: {poll_status} ({min(max(float(progress), 0.0), 1.0):.0%})")
+                            else:
+                                status.update(label=f"⏳ Image generation: {poll_status}")
+                    else:
+                        result['status'] = 'image_timeout'
+                        st.session_state.last_image_error = "⏰ Image generation is taking longer than expected. Using fallback image."
+                        final_label, final_state = st.session_state.last_image_error, "error"
+                elif status_code == 200 and result.get('success', True):
+                    final_label, final_state = "✅ Creative generated!", "complete"
+                else:
+                    final_label, final_state = "❌ Error generating creative", "error"
+                status.update(label=final_label, state=final_state)
+
+            # Store result in session state for display in right column
+            st.session_state.last_result = result
+            st.session_state.last_status_code = status_code
+            st.session_state.last_run_status = {"label": final_label, "state": final_state}
+            # Fragment reruns don't touch the result panel, refresh the whole app
+            st.rerun()
+
+
+@st.fragment
+def result_panel_fragment():
+    """Generated creative panel, rendered from st.session_state.last_result"""
+    st.header("🎨 Generated Creative")
+
+    # Display the creative content from session state
+    if st.session_state.get('last_result'):
+        result = st.session_state.last_result
+        status_code = st.session_state.get('last_status_code', 200)
+
+        # How the last generation ended, kept from the form's status container
+        run_status = st.session_state.get('last_run_status')
+        if run_status:
+            st.status(run_status['label'], state=run_status['state'], expanded=False)
+
+        # Display results
+        if status_code == 200 and result.get('success', True):
+            if result.get('status') == 'image_generated':
+                st.markdown('<div class="success-message">✅ Creative generated successfully with AI image!</div>', unsafe_allow_html=True)
+            elif st.session_state.get('last_image_error'):
+                st.markdown(f'<div class="error-message">{html.escape(st.session_state.last_image_error)}</div>', unsafe_allow_html=True)
+            else:
+                st.markdown('<div class="success-message">✅ Creative generated successfully!</div>', unsafe_allow_html=True)
+        elif status_code == 500 and 'Image generation failed' in str(result.get('error', '')):
+            st.markdown('<div class="error-message">⚠️ Creative generated with fallback image (Image service unavailable)</div>', unsafe_allow_html=True)
         else:
-            return {"error": f"Polling failed: {response.status_code}"}
-    except requests.exceptions.RequestException as e:
-        return {"error": f"Polling error: {str(e)}"}
+            st.markdown('<div class="error-message">❌ Error generating creative. Using demo data.</div>', unsafe_allow_html=True)
+
+        # Display the creative content
+        if result.get('creative'):
+            creative = result['creative']
+
+            # Image - Display prominently at the top
+            if creative.get('image_url'):
+                image = st.session_state.get('last_image_bytes') or creative['image_url']
+                st.image(image, caption="Generated Creative", width="stretch")
+
+            # Copy
+            if creative.get('copy', {}).get('subject') or creative.get('copy', {}).get('body'):
+                st.subheader("📝 Generated Copy")
+                if creative['copy'].get('subject'):
+                    st.write(f"**Subject:** {creative['copy']['subject']}")
+                if creative['copy'].get('body'):
+                    st.write(f"**Body:** {creative['copy']['body']}")
+
+            # Persona
+            if creative.get('persona'):
+                st.subheader("👤 Persona")
+                st.write(f"**Type:** {creative['persona']}")
+                if creative.get('color_palette'):
+                    st.write(f"**Color Palette:** {', '.join(creative['color_palette'])}")
+
+            # BFL Prompt (for debugging)
+            if creative.get('bfl_prompt'):
+                with st.expander("🔍 BFL Prompt Used"):
+                    st.text(creative['bfl_prompt'])
+
+        # Debug: Request/response exchange (collapsible)
+        if st.session_state.get('debug'):
+            with st.expander("🔍 Debug: API exchange"):
+                st.write(f"**Status Code:** {status_code}")
+                st.json({"request": st.session_state.get('last_request', {}), "response": result})
+    else:
+        st.info("👈 Fill out the form and click 'Generate Creative' to see results here")
+
 
 def main():
     st.markdown('<h1 class="main-header">🎨 Fashion Creative Generator</h1>', unsafe_allow_html=True)
     
+    # Initialize session state
+    st.session_state.setdefault('sample_data', {})
+    for key, value in FORM_DEFAULTS.items():
+        st.session_state.setdefault(key, value)
+    
     # Load personas data
-    personas_df = load_personas_from_excel()
+    personas_df, persona_counts, persona_records = load_personas_from_excel()
     
     # Sidebar
     with st.sidebar:
         st.header("📊 Data Overview")
         if not personas_df.empty:
-            st.write(f"**Total Personas:** {len(personas_df)}")
-            st.write(f"**Columns:** {len(personas_df.columns)}")
+            overview = f"**Total Personas:** {len(personas_df)}\n\n**Columns:** {len(personas_df.columns)}"
             
             # Show persona types
-            if 'persona_label' in personas_df.columns:
-                persona_counts = personas_df['persona_label'].value_counts()
-                st.write("**Persona Distribution:**")
-                st.write(persona_counts)
+            if not persona_counts.empty:
+                st.markdown(f"{overview}\n\n**Persona Distribution:**")
+                st.dataframe(persona_counts)
+            else:
+                st.markdown(overview)
         else:
             st.warning("No personas data loaded")
         
+        st.checkbox("🔍 Debug", key="debug", help="Show the raw API exchange")
+        
         st.header("🎲 Random Actions")
         if st.button("🎲 Random Persona", type="secondary"):
-            if not personas_df.empty:
-                random_persona = personas_df.sample(1).iloc[0]
-                st.session_state.sample_data = random_persona.to_dict()
+            if persona_records:
+                random_persona = random.choice(persona_records)
+                apply_persona(random_persona)
                 st.success(f"Selected: {random_persona.get('display_name', 'Unknown')}")
             else:
                 st.error("No personas available")
         
         if st.button("🎨 Generate Random Creative", type="primary"):
-            if not personas_df.empty:
-                random_persona = personas_df.sample(1).iloc[0]
-                st.session_state.sample_data = random_persona.to_dict()
+            if persona_records:
+                random_persona = random.choice(persona_records)
+                apply_persona(random_persona)
                 st.session_state.auto_generate = True
                 st.success("Random creative generation triggered!")
             else:
@@ -147,388 +692,19 @@ def main():
     col1, col2 = st.columns([1, 1])
     
     with col1:
-        st.header("👤 User Profile")
-        
-        # Initialize session state
-        if 'sample_data' not in st.session_state:
-            st.session_state.sample_data = {}
-        
-        # Form fields
-        with st.form("user_profile_form"):
-            # Basic Info
-            st.subheader("Basic Information")
-            email = st.text_input(
-                "Email *", 
-                value=st.session_state.sample_data.get('email', ''),
-                help="Required field"
-            )
-            display_name = st.text_input(
-                "Display Name *", 
-                value=st.session_state.sample_data.get('display_name', ''),
-                help="Required field"
-            )
-            
-            # Location
-            col_country, col_city = st.columns(2)
-            with col_country:
-                country = st.text_input(
-                    "Country",
-                    value=st.session_state.sample_data.get('country', 'US')
-                )
-            with col_city:
-                city = st.text_input(
-                    "City",
-                    value=st.session_state.sample_data.get('city', 'New York')
-                )
-            
-            # Social Media Info
-            st.subheader("Social Media Profile")
-            col_followers, col_posts = st.columns(2)
-            with col_followers:
-                followers = st.number_input(
-                    "Followers",
-                    min_value=0,
-                    value=int(st.session_state.sample_data.get('followers', 1000))
-                )
-            with col_posts:
-                posts_count = st.number_input(
-                    "Posts Count",
-                    min_value=0,
-                    value=int(st.session_state.sample_data.get('posts_count', 100))
-                )
-            
-            col_private, col_verified = st.columns(2)
-            with col_private:
-                is_private = st.checkbox(
-                    "Private Account",
-                    value=st.session_state.sample_data.get('is_private', False)
-                )
-            with col_verified:
-                is_verified = st.checkbox(
-                    "Verified Account",
-                    value=st.session_state.sample_data.get('is_verified', False)
-                )
-            
-            # Persona Info
-            st.subheader("Persona Information")
-            col_persona, col_confidence = st.columns(2)
-            with col_persona:
-                persona_label = st.text_input(
-                    "Persona Label",
-                    value=st.session_state.sample_data.get('persona_label', 'Demo')
-                )
-            with col_confidence:
-                persona_confidence = st.slider(
-                    "Persona Confidence",
-                    min_value=0.0,
-                    max_value=1.0,
-                    value=st.session_state.sample_data.get('persona_confidence', 0.8),
-                    step=0.1,
-                    help="Confidence level of persona classification"
-                )
-            
-            # Style Preferences
-            st.subheader("Style Preferences")
-            style_palette = st.text_input(
-                "Style Palette",
-                value=st.session_state.sample_data.get('style_palette', 'minimalist,bold'),
-                help="Comma-separated values"
-            )
-            archetypes = st.text_input(
-                "Archetypes",
-                value=st.session_state.sample_data.get('archetypes', 'LuxuryClassic'),
-                help="Comma-separated values"
-            )
-            color_palette = st.text_input(
-                "Color Palette",
-                value=st.session_state.sample_data.get('color_palette', '#1E90FF,#8B4513,#C0C0C0'),
-                help="Comma-separated hex colors"
-            )
-            
-            # Demographics
-            st.subheader("Demographics")
-            col_age, col_gender = st.columns(2)
-            with col_age:
-                age_range = st.selectbox(
-                    "Age Range",
-                    ["18-24", "25-34", "35-44", "45-54", "55-64", "65+"],
-                    index=1,
-                    key="age_range_select"
-                )
-            with col_gender:
-                gender = st.selectbox(
-                    "Gender",
-                    ["male", "female", "unisex", "non-binary"],
-                    index=2,
-                    key="gender_select"
-                )
-            
-            col_peak_hours, col_price = st.columns(2)
-            with col_peak_hours:
-                peak_hours = st.text_input(
-                    "Peak Hours",
-                    value=st.session_state.sample_data.get('peak_hours', '9-17'),
-                    help="e.g., 9-17, 18-22"
-                )
-            with col_price:
-                price_tier = st.selectbox(
-                    "Price Tier",
-                    ["budget", "mid", "premium", "luxury"],
-                    key="price_tier_demographics"
-                )
-            
-            # Content Preferences
-            st.subheader("Content Preferences")
-            preferred_category = st.selectbox(
-                "Preferred Category",
-                ["fashion", "lifestyle", "beauty", "travel", "food", "tech"],
-                index=0,
-                key="preferred_category_select"
-            )
-            
-            copy_tone = st.selectbox(
-                "Copy Tone",
-                ["friendly", "luxury", "minimal", "bold", "casual", "professional"],
-                index=0,
-                key="copy_tone_select"
-            )
-            
-            
-            # Submit button
-            submitted = st.form_submit_button("🎨 Generate Creative", type="primary")
-            
-            # Auto-generate if random creative was requested
-            if st.session_state.get('auto_generate', False):
-                submitted = True
-                st.session_state.auto_generate = False  # Reset the flag
-            
-            # Handle form submission INSIDE the form context
-            if submitted:
-                # Validate required fields
-                if not email or not display_name:
-                    st.error("Please fill in the required fields: Email and Display Name")
-                else:
-                    # Prepare data in the format expected by the local server
-                    # Split semicolon-separated strings into arrays
-                    def split_string(str_val):
-                        if not str_val or isinstance(str_val, (int, float)):
-                            return []
-                        return [s.strip() for s in str(str_val).split(',') if s.strip()]
-                    
-                    # Build profile object
-                    profile = {
-                        "contact_id": st.session_state.sample_data.get('id', f"FASH-{int(time.time())}"),
-                        "email": email,
-                        "firstname": display_name.split(' ')[0] if display_name else 'Demo',
-                        "lastname": ' '.join(display_name.split(' ')[1:]) if display_name and ' ' in display_name else '',
-                        "locale": st.session_state.sample_data.get('language', 'en-US'),
-                        "country": country,
-                        "city": city,
-                        "tags": split_string(style_palette),
-                        "interest_keywords": split_string(archetypes),
-                        "age_range": age_range,
-                        "gender": gender,
-                        "budget_range": price_tier,
-                        "persona_label": persona_label,
-                        "persona_confidence": persona_confidence,
-                        "followers": followers,
-                        "following": st.session_state.sample_data.get('following', 0),
-                        "posts_count": posts_count,
-                        "is_private": is_private,
-                        "is_verified": is_verified,
-                        "preferred_category": preferred_category,
-                        "peak_hours": peak_hours,
-                        "copy_tone": copy_tone
-                    }
-                    
-                    # Build product object
-                    product = {
-                        "sku": f"SKU-{st.session_state.sample_data.get('id', 'DEMO')}",
-                        "title": f"Premium Fashion Item for {persona_label}",
-                        "category": "hoodies",
-                        "colorways": split_string(color_palette),
-                        "price_band": price_tier,
-                        "launch_type": "drop",
-                        "brand_name": "Demo Brand",
-                        "season": "all-season",
-                        "material": "cotton"
-                    }
-                    
-                    # Build options object
-                    options = {
-                        "aspect": "1:1",
-                        "channel": "instagram_feed",
-                        "fallback_image_url": "https://dummyimage.com/1080x1080/111827/f5f5f5.png&text=Backup",
-                        "ab_variant": "A",
-                        "style_preference": "modern",
-                        "mood": "confident",
-                        "target_audience": "fashion_enthusiasts"
-                    }
-                    
-                    # Final data structure expected by the server
-                    data = {
-                        "profile": profile,
-                        "product": product,
-                        "options": options,
-                        "metadata": {
-                            "source": "streamlit_frontend",
-                            "timestamp": datetime.now().isoformat(),
-                            "version": "2.0",
-                            "persona_json": st.session_state.sample_data.get('persona_json', '{}')
-                        }
-                    }
-                    
-                    # Show loading
-                    with st.spinner("🎨 Generating your fashion creative..."):
-                        # Debug: Show data being sent (collapsible)
-                        with st.expander("🔍 Debug: Data being sent to API"):
-                            st.json(data)
-                        
-                        # Call API
-                        result, status_code = call_local_server(data)
-                    
-                    # Debug: Show what we received
-                    st.write("🔍 **DEBUG - API Response:**")
-                    st.write(f"- Status Code: {status_code}")
-                    st.write(f"- Success: {result.get('success')}")
-                    st.write(f"- Status: {result.get('status')}")
-                    st.write(f"- Has Request ID: {bool(result.get('creative', {}).get('request_id'))}")
-                    if result.get('creative', {}).get('request_id'):
-                        st.write(f"- Request ID: {result['creative']['request_id']}")
-                    
-                    # Debug: Show full response if there's an error
-                    if status_code != 200:
-                        st.write("🔍 **DEBUG - Full Error Response:**")
-                        st.write(f"Raw response: {result}")
-                        st.write(f"Response type: {type(result)}")
-                        if isinstance(result, dict):
-                            st.write(f"Response keys: {list(result.keys())}")
-                            if 'error' in result:
-                                st.write(f"Error message: {result['error']}")
-                    
-                    # Check if we need to poll for image
-                    if (status_code == 200 and result.get('success', True) and 
-                        result.get('status') == 'image_polling' and 
-                        result.get('creative', {}).get('request_id')):
-                        
-                        request_id = result['creative']['request_id']
-                        st.info(f"🔄 Image generation started! Polling for result... (Request ID: {request_id})")
-                        
-                        # Poll for the final image
-                        with st.spinner("⏳ Waiting for image generation to complete..."):
-                            max_polls = 20  # 20 polls max (10 seconds)
-                            poll_count = 0
-                            
-                            # Debug: Show polling progress
-                            progress_bar = st.progress(0)
-                            status_text = st.empty()
-                            
-                            while poll_count < max_polls:
-                                poll_result = poll_for_image(request_id)
-                                poll_count += 1
-                                
-                                # Debug: Show polling result
-                                st.write(f"🔍 **Poll {poll_count}:** Status = {poll_result.get('status', 'Unknown')}, Error = {poll_result.get('error', 'None')}")
-                                
-                                # Update progress
-                                progress = min(poll_count / max_polls, 1.0)
-                                progress_bar.progress(progress)
-                                status_text.text(f"Polling attempt {poll_count}/{max_polls} - Status: {poll_result.get('status', 'Unknown')}")
-                                
-                                if poll_result.get('status') == 'Ready':
-                                    # Update the result with the final image
-                                    if poll_result.get('result', {}).get('sample'):
-                                        result['creative']['image_url'] = poll_result['result']['sample']
-                                        result['status'] = 'image_generated'
-                                        progress_bar.progress(1.0)
-                                        status_text.text("✅ Image generation completed!")
-                                        st.success("✅ AI image generated successfully!")
-                                        st.write(f"🔍 **Final Image URL:** {poll_result['result']['sample'][:50]}...")
-                                    break
-                                elif poll_result.get('status') in ['Error', 'Failed']:
-                                    st.warning(f"⚠️ Image generation failed: {poll_result.get('error', 'Unknown error')}")
-                                    break
-                                else:
-                                    # Still processing, wait a bit
-                                    time.sleep(0.5)
-                            
-                            if poll_count >= max_polls:
-                                st.warning("⏰ Image generation is taking longer than expected. Using fallback image.")
-                                progress_bar.empty()
-                                status_text.empty()
-                    
-                    # Display results
-                    if status_code == 200 and result.get('success', True):
-                        if result.get('status') == 'image_generated':
-                            st.markdown('<div class="success-message">✅ Creative generated successfully with AI image!</div>', unsafe_allow_html=True)
-                        else:
-                            st.markdown('<div class="success-message">✅ Creative generated successfully!</div>', unsafe_allow_html=True)
-                    elif status_code == 500 and 'Image generation failed' in str(result.get('error', '')):
-                        st.markdown('<div class="error-message">⚠️ Creative generated with fallback image (Image service unavailable)</div>', unsafe_allow_html=True)
-                    else:
-                        st.markdown('<div class="error-message">❌ Error generating creative. Using demo data.</div>', unsafe_allow_html=True)
-                    
-                    # Store result in session state for display in right column
-                    st.session_state.last_result = result
-                    st.session_state.last_status_code = status_code
+        profile_form_fragment()
     
     with col2:
-        st.header("🎨 Generated Creative")
-        
-        # Display the creative content from session state
-        if st.session_state.get('last_result'):
-            result = st.session_state.last_result
-            status_code = st.session_state.get('last_status_code', 200)
-            
-            # Display results
-            if status_code == 200 and result.get('success', True):
-                if result.get('status') == 'image_generated':
-                    st.markdown('<div class="success-message">✅ Creative generated successfully with AI image!</div>', unsafe_allow_html=True)
-                else:
-                    st.markdown('<div class="success-message">✅ Creative generated successfully!</div>', unsafe_allow_html=True)
-            elif status_code == 500 and 'Image generation failed' in str(result.get('error', '')):
-                st.markdown('<div class="error-message">⚠️ Creative generated with fallback image (Image service unavailable)</div>', unsafe_allow_html=True)
-            else:
-                st.markdown('<div class="error-message">❌ Error generating creative. Using demo data.</div>', unsafe_allow_html=True)
-            
-            # Display the creative content
-            if result.get('creative'):
-                creative = result['creative']
-                
-                # Image - Display prominently at the top
-                if creative.get('image_url'):
-                    st.image(creative['image_url'], caption="Generated Creative", use_column_width=True)
-                
-                # Copy
-                if creative.get('copy', {}).get('subject') or creative.get('copy', {}).get('body'):
-                    st.subheader("📝 Generated Copy")
-                    if creative['copy'].get('subject'):
-                        st.write(f"**Subject:** {creative['copy']['subject']}")
-                    if creative['copy'].get('body'):
-                        st.write(f"**Body:** {creative['copy']['body']}")
-                
-                # Persona
-                if creative.get('persona'):
-                    st.subheader("👤 Persona")
-                    st.write(f"**Type:** {creative['persona']}")
-                    if creative.get('color_palette'):
-                        st.write(f"**Color Palette:** {', '.join(creative['color_palette'])}")
-                
-                # BFL Prompt (for debugging)
-                if creative.get('bfl_prompt'):
-                    with st.expander("🔍 BFL Prompt Used"):
-                        st.text(creative['bfl_prompt'])
-        else:
-            st.info("👈 Fill out the form and click 'Generate Creative' to see results here")
+        result_panel_fragment()
     
     # Footer
     st.markdown("---")
     st.markdown(
         """
         <div style="text-align: center; color: #666; font-size: 0.8em;">
-            <p>🎨 Fashion Creative Generator | Powered by AI | Generated on {}</p>
+            <p>🎨 Fashion Creative Generator | Powered by AI</p>
         </div>
-        """.format(datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+        """,
         unsafe_allow_html=True
     )
 